@@ -3,10 +3,16 @@ from __future__ import annotations
 
 import argparse
 import copy
+import functools
+import io
 import json
+import math
+import os
+import re
+import shutil
 import sys
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator
 
 try:
     import tomllib
@@ -148,6 +154,18 @@ except ModuleNotFoundError:
         def loads(s: str) -> dict:
             return _MinimalTomllib.loads(s)
 
+try:
+    # Optional Rust-backed parser (same loads() contract); much faster on large configs.
+    import rtoml as _toml_parser  # type: ignore[import-not-found]
+except ImportError:
+    _toml_parser = tomllib
+
+try:
+    # Optional native JSON codec for the state file.
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Merge or remove Codex config TOML.")
@@ -162,158 +180,252 @@ def parse_args() -> argparse.Namespace:
     remove_parser = subparsers.add_parser("remove", help="Remove repo-managed config from target.")
     remove_parser.add_argument("--target", required=True, type=Path)
     remove_parser.add_argument("--state", required=True, type=Path)
+    remove_parser.add_argument(
+        "--fast-remove",
+        action="store_true",
+        help="Revert single-line scalar entries in place without re-parsing the target.",
+    )
 
     return parser.parse_args()
 
 
+def write_text_atomic(path: Path, text: str) -> None:
+    data = text.encode("utf-8")
+    # Resolve so a symlinked config is updated at its real location, not replaced.
+    target = path.resolve()
+    if target.exists() and target.read_bytes() == data:
+        return
+    tmp = target.with_name(f"{target.name}.tmp")
+    tmp.write_bytes(data)
+    if target.exists():
+        shutil.copymode(target, tmp)
+    os.replace(tmp, target)
+
+
+# orjson reads integers past 64 bits as floats; leave any long digit run to json.
+_LONG_DIGITS_RE = re.compile(rb"\d{19,}")
+
+
+def load_state(path: Path) -> Any:
+    raw = path.read_bytes()
+    if orjson is not None and not _LONG_DIGITS_RE.search(raw):
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # State written by the json module may hold Infinity/NaN, which orjson rejects.
+            pass
+    return json.loads(raw)
+
+
+def has_non_finite_float(value: Any) -> bool:
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if type(item) is float:
+            if not math.isfinite(item):
+                return True
+        elif type(item) is dict:
+            stack.extend(item.values())
+        elif type(item) is list:
+            stack.extend(item)
+    return False
+
+
+def dump_state(state: dict[str, Any]) -> str:
+    # orjson writes inf/nan as null, which would lose the value on remove.
+    if orjson is not None and not has_non_finite_float(state):
+        options = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(state, option=options).decode("utf-8")
+        except orjson.JSONEncodeError:
+            # e.g. integers outside the 64-bit range, which json handles.
+            pass
+    return json.dumps(state, indent=2, sort_keys=True)
+
+
+def load_toml_data(path: Path) -> dict[str, Any]:
+    # For callers that only need the parsed table, not the text for extract_header.
+    raw = path.read_bytes()
+    return _toml_parser.loads(raw.decode("utf-8")) if raw.strip() else {}
+
+
 def load_toml(path: Path) -> tuple[dict[str, Any], str]:
     text = path.read_text(encoding="utf-8")
-    data = tomllib.loads(text) if text.strip() else {}
+    data = _toml_parser.loads(text) if text.strip() else {}
     return data, text
 
 
+# TOML only ends lines at these; other str.splitlines() breaks may sit in comments/strings.
+_LINE_BREAK_RE = re.compile(r"\r\n|\r|\n")
+# Leading run of blank and comment lines; the last line may lack a newline.
+_HEADER_RE = re.compile(r"(?:[ \t]*(?:#[^\r\n]*)?(?:\r\n|\r|\n))*(?:[ \t]*#[^\r\n]*\Z)?")
+
+
 def extract_header(text: str) -> list[str]:
-    lines: list[str] = []
-    for line in text.splitlines():
-        stripped = line.strip()
-        if stripped == "":
-            continue
-        if stripped.startswith("#"):
-            lines.append(line)
-            continue
-        break
-    return lines
+    match = _HEADER_RE.match(text)
+    header = match.group(0) if match else ""
+    return [line for line in _LINE_BREAK_RE.split(header) if line.strip(" \t")]
 
 
-def is_dict(value: Any) -> bool:
-    return isinstance(value, dict)
+# Parsed TOML and state JSON only hold plain dicts, so tables are tested with `type(x) is dict`.
+_MISSING = object()
 
 
-def merge_dicts(base: dict[str, Any], overlay: dict[str, Any]) -> dict[str, Any]:
-    merged: dict[str, Any] = {}
-    for key in base:
-        if key in overlay:
-            base_val = base[key]
-            overlay_val = overlay[key]
-            if is_dict(base_val) and is_dict(overlay_val):
-                merged[key] = merge_dicts(base_val, overlay_val)
-            else:
-                merged[key] = overlay_val
-        else:
-            merged[key] = base[key]
-    for key in overlay:
-        if key not in base:
-            merged[key] = overlay[key]
-    return merged
+def intern_keys(data: dict[str, Any]) -> dict[str, Any]:
+    # Rebuild each table with interned keys (assigning to an existing key keeps the old
+    # key object), so the repeated names across tables hit identity in dict lookups.
+    root: dict[str, Any] = {sys.intern(key): value for key, value in data.items()}
+    stack: list[dict[str, Any]] = [root]
+    while stack:
+        table = stack.pop()
+        for key, value in table.items():
+            if type(value) is dict:
+                child: dict[str, Any] = {sys.intern(k): v for k, v in value.items()}
+                table[key] = child
+                stack.append(child)
+    return root
 
 
-def collect_additions(path: list[str], repo_val: Any, additions: list[dict[str, Any]]) -> None:
-    if is_dict(repo_val):
-        for key, value in repo_val.items():
-            collect_additions(path + [key], value, additions)
-        return
-    additions.append({"path": path, "repo": repo_val})
+def collect_additions(
+    path: tuple[str, ...], repo_val: Any, additions: list[dict[str, Any]]
+) -> None:
+    stack: list[tuple[tuple[str, ...], Any]] = [(path, repo_val)]
+    while stack:
+        current_path, value = stack.pop()
+        if type(value) is dict:
+            # Push in reverse so entries are recorded in document order.
+            stack.extend((current_path + (key,), child) for key, child in reversed(value.items()))
+            continue
+        additions.append({"path": current_path, "repo": value})
 
 
-def collect_changes(
-    path: list[str],
-    repo_val: Any,
-    existing_val: Any,
-    exists: bool,
+def merge_and_diff(
+    path: tuple[str, ...],
+    base: dict[str, Any],
+    overlay: dict[str, Any],
     additions: list[dict[str, Any]],
     overrides: list[dict[str, Any]],
-) -> None:
-    repo_is_dict = is_dict(repo_val)
-    existing_is_dict = is_dict(existing_val)
-
-    if repo_is_dict:
-        if exists and not existing_is_dict:
-            overrides.append({"path": path, "previous": existing_val, "repo": repo_val})
-            return
-        if not exists:
-            collect_additions(path, repo_val, additions)
-            return
-        for key, value in repo_val.items():
-            if key in existing_val:
-                collect_changes(path + [key], value, existing_val[key], True, additions, overrides)
-            else:
-                collect_additions(path + [key], value, additions)
-        return
-
-    if exists and existing_is_dict:
-        overrides.append({"path": path, "previous": existing_val, "repo": repo_val})
-        return
+) -> dict[str, Any]:
+    # Each merged table starts as {**base, **overlay}, built at full size in one go:
+    # base keys keep their order, repo-only keys follow, and repo values already win.
+    # The loop below only records the diff and patches table-vs-table entries.
+    merged: dict[str, Any] = {**base, **overlay}
+    # Each frame keeps its own items iterator, so descending into a subtable
+    # and resuming afterwards visits keys in the same order as recursion would.
+    # Frames under a subtable that already equals the repo's skip diff recording.
+    stack: list[
+        tuple[tuple[str, ...], dict[str, Any], Iterator[tuple[str, Any]], dict[str, Any], bool]
+    ] = [(path, base, iter(overlay.items()), merged, True)]
+    while stack:
+        table_path, base_table, items, out, record = stack[-1]
+        for key, overlay_val in items:
+            key_path = table_path + (key,)
+            base_val = base_table.get(key, _MISSING)
+            if base_val is _MISSING:
+                collect_additions(key_path, overlay_val, additions)
+                continue
+            base_is_dict = type(base_val) is dict
+            overlay_is_dict = type(overlay_val) is dict
+            if base_is_dict and overlay_is_dict:
+                if base_val is overlay_val:
+                    continue
+                # Equal tables have nothing to record, but are still merged so the
+                # repo's values (e.g. true vs 1) and the existing key order both hold.
+                child_record = record and base_val != overlay_val
+                child: dict[str, Any] = {**base_val, **overlay_val}
+                out[key] = child
+                stack.append((key_path, base_val, iter(overlay_val.items()), child, child_record))
+                break
+            if record and (base_is_dict or overlay_is_dict or base_val != overlay_val):
+                overrides.append({"path": key_path, "previous": base_val, "repo": overlay_val})
+        else:
+            stack.pop()
+    return merged
 
-    if exists:
-        if existing_val != repo_val:
-            overrides.append({"path": path, "previous": existing_val, "repo": repo_val})
-        return
 
-    additions.append({"path": path, "repo": repo_val})
+_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"'})
 
 
+@functools.lru_cache(maxsize=1024)
 def format_key(key: str) -> str:
     if key.replace("_", "").replace("-", "").isalnum():
         return key
-    escaped = key.replace("\\", "\\\\").replace('"', '\\"')
+    escaped = key.translate(_ESCAPES)
     return f"\"{escaped}\""
 
 
 def format_string(value: str) -> str:
+    # Escaping every quote also covers embedded triple quotes in multi-line strings.
+    escaped = value.translate(_ESCAPES)
     if "\n" in value:
-        escaped = value.replace("\\", "\\\\").replace('"""', '\\"""').replace('"', '\\"')
         return f"\"\"\"{escaped}\"\"\""
-    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
     return f"\"{escaped}\""
 
 
+def format_list(value: list[Any]) -> str:
+    formatted_items = ", ".join(map(format_value, value))
+    return f"[{formatted_items}]"
+
+
+# Keyed by exact type, so bool never falls through to the int formatter.
+_FORMATTERS: dict[type, Callable[[Any], str]] = {
+    bool: lambda value: "true" if value else "false",
+    int: str,
+    float: repr,
+    str: format_string,
+    list: format_list,
+}
+
+
 def format_value(value: Any) -> str:
-    if isinstance(value, bool):
-        return "true" if value else "false"
-    if isinstance(value, int):
-        return str(value)
-    if isinstance(value, float):
-        return repr(value)
-    if isinstance(value, str):
-        return format_string(value)
-    if isinstance(value, list):
-        formatted_items = ", ".join(format_value(item) for item in value)
-        return f"[{formatted_items}]"
-    raise ValueError(f"Unsupported TOML value type: {type(value).__name__}")
+    formatter = _FORMATTERS.get(type(value))
+    if formatter is None:
+        raise ValueError(f"Unsupported TOML value type: {type(value).__name__}")
+    return formatter(value)
 
 
 def dump_toml(data: dict[str, Any], header: list[str] | None = None) -> str:
-    lines: list[str] = []
+    buf = io.StringIO()
     if header:
-        lines.extend(header)
-        lines.append("")
-
-    def emit_table(path: list[str], table: dict[str, Any]) -> None:
-        if path:
+        for line in header:
+            buf.write(f"{line}\n")
+        buf.write("\n")
+    # Subtables are separated by a blank line unless one was just written.
+    needs_blank = False
+
+    def emit_table(
+        write: Callable[[str], int], path: tuple[str, ...], table: dict[str, Any]
+    ) -> None:
+        nonlocal needs_blank
+        scalars: list[tuple[str, Any]] = []
+        tables: list[tuple[str, dict[str, Any]]] = []
+        for item in table.items():
+            (tables if type(item[1]) is dict else scalars).append(item)
+
+        # A table holding only subtables is implied by their headers; empty tables keep theirs.
+        if path and (scalars or not tables):
             dotted = ".".join(format_key(part) for part in path)
-            lines.append(f"[{dotted}]")
+            write(f"[{dotted}]\n")
+            needs_blank = True
 
-        for key, value in table.items():
-            if is_dict(value):
-                continue
-            lines.append(f"{format_key(key)} = {format_value(value)}")
+        for key, value in scalars:
+            write(f"{format_key(key)} = {format_value(value)}\n")
+            needs_blank = True
 
-        for key, value in table.items():
-            if not is_dict(value):
-                continue
-            if lines and lines[-1] != "":
-                lines.append("")
-            emit_table(path + [key], value)
+        for key, value in tables:
+            if needs_blank:
+                write("\n")
+                needs_blank = False
+            emit_table(write, path + (key,), value)
 
-    emit_table([], data)
-    output = "\n".join(lines).rstrip() + "\n"
-    return output
+    emit_table(buf.write, (), data)
+    return buf.getvalue().rstrip() + "\n"
 
 
 def path_get(data: dict[str, Any], path: list[str]) -> Any:
     current: Any = data
     for key in path:
-        if not is_dict(current) or key not in current:
+        if type(current) is not dict or key not in current:
             return None
         current = current[key]
     return current
@@ -322,51 +434,97 @@ def path_get(data: dict[str, Any], path: list[str]) -> Any:
 def path_set(data: dict[str, Any], path: list[str], value: Any) -> None:
     current = data
     for key in path[:-1]:
-        if key not in current or not is_dict(current[key]):
+        if key not in current or type(current[key]) is not dict:
             current[key] = {}
         current = current[key]
     current[path[-1]] = value
 
 
-def path_delete(data: dict[str, Any], path: list[str]) -> bool:
-    current = data
-    parents: list[tuple[dict[str, Any], str]] = []
-    for key in path[:-1]:
-        if key not in current or not is_dict(current[key]):
-            return False
-        parents.append((current, key))
-        current = current[key]
-    if path[-1] not in current:
-        return False
-    del current[path[-1]]
-    for parent, key in reversed(parents):
-        child = parent.get(key)
-        if is_dict(child) and not child:
-            del parent[key]
+def delete_paths(data: dict[str, Any], paths: list[list[str]]) -> None:
+    # Build a trie of the leaves to delete so shared prefixes are walked once.
+    trie: dict[str, Any] = {}
+    for path in paths:
+        if not path:
+            continue
+        node = trie
+        for key in path[:-1]:
+            child = node.setdefault(key, {})
+            if child is None:
+                # An ancestor is already being deleted outright.
+                break
+            node = child
+        else:
+            node[path[-1]] = None
+
+    # Depth-first over the trie; tables emptied by the deletions are pruned on the way up.
+    stack: list[
+        tuple[dict[str, Any] | None, str, dict[str, Any], Iterator[tuple[str, Any]]]
+    ] = [(None, "", data, iter(trie.items()))]
+    while stack:
+        parent, parent_key, table, items = stack[-1]
+        for key, child in items:
+            if child is None:
+                table.pop(key, None)
+                continue
+            value = table.get(key)
+            if type(value) is dict:
+                stack.append((table, key, value, iter(child.items())))
+                break
         else:
-            break
-    return True
+            stack.pop()
+            if parent is not None and not table:
+                del parent[parent_key]
+
 
+def opencode_cache_path(state_path: Path) -> Path:
+    return state_path.parent / ".opencode.cache.json"
 
-def apply_opencode_permissions(repo_data: dict[str, Any], opencode_path: Path | None) -> None:
+
+def load_skill_permissions(opencode_path: Path, cache_path: Path | None) -> dict[str, Any]:
+    stat = opencode_path.stat()
+    cache_key = {
+        "path": str(opencode_path.resolve()),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+    }
+    if cache_path is not None and cache_path.exists():
+        try:
+            cached = json.loads(cache_path.read_bytes())
+        except ValueError:
+            cached = None
+        if type(cached) is dict and cached.get("key") == cache_key:
+            cached_skill = cached.get("skill")
+            if type(cached_skill) is dict:
+                return cached_skill
+
+    config = json.loads(opencode_path.read_bytes())
+    perms = config.get("permission", {}).get("skill", {})
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache = {"key": cache_key, "skill": perms}
+        write_text_atomic(cache_path, json.dumps(cache) + "\n")
+    return perms
+
+
+def apply_opencode_permissions(
+    repo_data: dict[str, Any], opencode_path: Path | None, cache_path: Path | None = None
+) -> None:
     if not opencode_path:
         return
     if not opencode_path.exists():
         return
-    config = json.loads(opencode_path.read_text(encoding="utf-8"))
-    perms = config.get("permission", {}).get("skill", {})
+    perms = load_skill_permissions(opencode_path, cache_path)
     if not perms:
         return
-    permission = repo_data.setdefault("permission", {})
-    if not is_dict(permission):
+    permission = repo_data.get("permission")
+    if type(permission) is not dict:
         permission = {}
         repo_data["permission"] = permission
-    skill = permission.setdefault("skill", {})
-    if not is_dict(skill):
+    skill = permission.get("skill")
+    if type(skill) is not dict:
         skill = {}
         permission["skill"] = skill
-    for key, value in perms.items():
-        skill[key] = value
+    skill.update(perms)
 
 
 def revert_managed_changes(
@@ -392,6 +550,7 @@ def revert_managed_changes(
         else:
             skipped += 1
 
+    deletions: list[list[str]] = []
     for entry in additions:
         path = entry.get("path")
         repo_val = entry.get("repo")
@@ -401,16 +560,106 @@ def revert_managed_changes(
         if current is None:
             continue
         if current == repo_val:
-            path_delete(reverted, path)
+            deletions.append(path)
         else:
             skipped += 1
+    delete_paths(reverted, deletions)
 
     return reverted, skipped
 
 
+_TABLE_HEADER_RE = re.compile(r"^\[([^\[].*)\]$")
+
+
+def revert_managed_text(
+    text: str, config_state: dict[str, Any], existing_header: list[str]
+) -> str | None:
+    # Fast path for remove: edit the key lines install wrote instead of parsing the
+    # whole target. Returns None whenever the full parse/revert/dump path is needed.
+    if "'''" in text:
+        # Multi-line literal strings are not tracked below.
+        return None
+
+    targets: dict[str, dict[str, tuple[str, str | None]]] = {}
+    for kind in ("overrides", "additions"):
+        for entry in config_state.get(kind, []):
+            path = entry.get("path")
+            if not isinstance(path, list) or not path:
+                return None
+            values = [entry.get("repo")]
+            if kind == "overrides":
+                values.append(entry.get("previous"))
+            if any(type(value) is dict or value is None for value in values):
+                return None
+            try:
+                formatted = [format_value(value) for value in values]
+            except ValueError:
+                return None
+            if any("\n" in value for value in formatted):
+                return None
+            section = targets.setdefault(".".join(format_key(part) for part in path[:-1]), {})
+            key = format_key(path[-1])
+            if key in section:
+                return None
+            section[key] = (formatted[0], formatted[1] if kind == "overrides" else None)
+
+    # Swap the written header for the recorded one, as dump_toml does on the full path.
+    match = _HEADER_RE.match(text)
+    body = text[match.end():] if match else text
+    lines: list[str] = [*existing_header, ""] if existing_header else []
+    key_lines: dict[str, int] = {}
+    emptied: set[str] = set()
+    table = ""
+    in_multiline = False
+    dropped = False
+    for line in _LINE_BREAK_RE.split(body):
+        if in_multiline:
+            lines.append(line)
+            in_multiline = line.count('"""') % 2 == 0
+            continue
+        stripped = line.strip()
+        header_match = _TABLE_HEADER_RE.match(stripped)
+        if header_match:
+            table = header_match.group(1)
+        elif stripped.startswith("["):
+            # Arrays of tables or headers with trailing comments: let the full path decide.
+            return None
+        elif not stripped.startswith("#"):
+            in_multiline = line.count('"""') % 2 == 1
+            key, sep, value = line.partition(" = ")
+            if sep:
+                key_lines[table] = key_lines.get(table, 0) + 1
+                target = targets.get(table, {}).pop(key, None)
+                if target is not None:
+                    repo_fmt, previous_fmt = target
+                    if value != repo_fmt:
+                        return None
+                    if previous_fmt is None:
+                        key_lines[table] -= 1
+                        emptied.add(table)
+                        dropped = True
+                        continue
+                    line = f"{key} = {previous_fmt}"
+        if dropped and not stripped and (not lines or lines[-1] == ""):
+            continue
+        dropped = False
+        lines.append(line)
+
+    if any(targets.values()):
+        return None
+    # Emptied tables and an emptied file need the pruning/unlink logic of the full path.
+    if not any(key_lines.values()) or any(table and not key_lines[table] for table in emptied):
+        return None
+    return "\n".join(lines).rstrip() + "\n"
+
+
 def install(args: argparse.Namespace) -> int:
     repo_data, repo_text = load_toml(args.repo)
-    apply_opencode_permissions(repo_data, args.opencode)
+    # Opt-in: reuse the parsed skill permissions while opencode.json is unchanged.
+    cache_path: Path | None = None
+    if os.environ.get("CODEX_CONFIG_CACHE") == "1":
+        cache_path = opencode_cache_path(args.state)
+    apply_opencode_permissions(repo_data, args.opencode, cache_path)
 
     existing_data: dict[str, Any] = {}
     existing_header: list[str] = []
@@ -419,7 +668,7 @@ def install(args: argparse.Namespace) -> int:
         existing_data, existing_text = load_toml(args.target)
         existing_header = extract_header(existing_text)
         if args.state.exists():
-            prior_state = json.loads(args.state.read_text(encoding="utf-8"))
+            prior_state = load_state(args.state)
             config_state = prior_state.get("config", {})
             managed_content = config_state.get("managed_content")
             if isinstance(managed_content, str) and existing_text == managed_content:
@@ -434,19 +683,15 @@ def install(args: argparse.Namespace) -> int:
     additions: list[dict[str, Any]] = []
     overrides: list[dict[str, Any]] = []
 
-    for key, value in repo_data.items():
-        if key in existing_data:
-            collect_changes([key], value, existing_data[key], True, additions, overrides)
-        else:
-            collect_additions([key], value, additions)
-
-    merged = merge_dicts(existing_data, repo_data)
+    existing_data = intern_keys(existing_data)
+    repo_data = intern_keys(repo_data)
+    merged = merge_and_diff((), existing_data, repo_data, additions, overrides)
 
     repo_header = extract_header(repo_text)
     header = repo_header if repo_header else existing_header
     args.target.parent.mkdir(parents=True, exist_ok=True)
     managed_content = dump_toml(merged, header)
-    args.target.write_text(managed_content, encoding="utf-8")
+    write_text_atomic(args.target, managed_content)
 
     state = {
         "version": 1,
@@ -454,21 +699,22 @@ def install(args: argparse.Namespace) -> int:
             "path": str(args.target),
             "had_config": had_config,
             "existing_header": existing_header,
-            "additions": additions,
-            "overrides": overrides,
+            "additions": [{**entry, "path": list(entry["path"])} for entry in additions],
+            "overrides": [{**entry, "path": list(entry["path"])} for entry in overrides],
             "managed_content": managed_content,
         },
     }
     args.state.parent.mkdir(parents=True, exist_ok=True)
-    args.state.write_text(json.dumps(state, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    write_text_atomic(args.state, dump_state(state) + "\n")
     return 0
 
 
 def remove(args: argparse.Namespace) -> int:
+    opencode_cache_path(args.state).unlink(missing_ok=True)
     if not args.state.exists():
         print("  Skipping config removal (state file not found)")
         return 0
-    state = json.loads(args.state.read_text(encoding="utf-8"))
+    state = load_state(args.state)
     config_state = state.get("config", {})
     had_config = bool(config_state.get("had_config"))
     existing_header = config_state.get("existing_header", [])
@@ -478,17 +724,26 @@ def remove(args: argparse.Namespace) -> int:
         print("  Skipping config removal (config file missing)")
         return 0
 
-    data, _ = load_toml(args.target)
+    if args.fast_remove:
+        reverted_text = revert_managed_text(
+            args.target.read_text(encoding="utf-8"), config_state, existing_header
+        )
+        if reverted_text is not None:
+            write_text_atomic(args.target, reverted_text)
+            args.state.unlink(missing_ok=True)
+            return 0
+
+    data = load_toml_data(args.target)
 
     data, skipped = revert_managed_changes(data, config_state)
 
     if data:
-        args.target.write_text(dump_toml(data, existing_header), encoding="utf-8")
+        write_text_atomic(args.target, dump_toml(data, existing_header))
     else:
         if not had_config:
             args.target.unlink(missing_ok=True)
         else:
-            args.target.write_text(dump_toml(data, existing_header), encoding="utf-8")
+            write_text_atomic(args.target, dump_toml(data, existing_header))
 
     args.state.unlink(missing_ok=True)
     if skipped:
@@ -0,0 +1,250 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+CODEX_CONFIG="$REPO_ROOT/scripts/codex-config.py"
+
+fail() {
+    echo "FAIL: $*" >&2
+    exit 1
+}
+
+assert_not_exists() {
+    local path="$1"
+    [[ ! -e "$path" ]] || fail "Expected $path to be absent"
+}
+
+assert_file_contains() {
+    local path="$1"
+    local needle="$2"
+    grep -Fq -- "$needle" "$path" || fail "Expected '$needle' in $path"
+}
+
+run_phase() {
+    local label="$1"
+    shift
+    echo "==> $label"
+    "$@"
+}
+
+# Replace each OLD with NEW once in a file (OLD/NEW pairs follow the path).
+edit_file() {
+    python3 - "$@" <<'PY'
+import sys
+from pathlib import Path
+
+path = Path(sys.argv[1])
+text = path.read_text(encoding="utf-8")
+pairs = sys.argv[2:]
+for old, new in zip(pairs[0::2], pairs[1::2]):
+    if old not in text:
+        sys.exit(f"edit_file: {old!r} not found in {path}")
+    text = text.replace(old, new, 1)
+path.write_text(text, encoding="utf-8")
+PY
+}
+
+# Succeed when both files are missing or parse to the same TOML data. Comments and
+# layout may differ: the full remove rewrites the file, --fast-remove keeps it.
+same_toml() {
+    python3 - "$CODEX_CONFIG" "$1" "$2" <<'PY'
+import importlib.util
+import sys
+from pathlib import Path
+
+spec = importlib.util.spec_from_file_location("codex_config", sys.argv[1])
+codex_config = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(codex_config)
+
+def load(path):
+    path = Path(path)
+    return codex_config.load_toml_data(path) if path.exists() else None
+
+sys.exit(load(sys.argv[2]) != load(sys.argv[3]))
+PY
+}
+
+# Install REPO over a copy of TARGET, apply the optional user edits, then remove the
+# managed config once with the full parse path and once with --fast-remove.
+check_fast_remove() {
+    local name="$1"
+    local repo="$2"
+    local target="$3"
+    shift 3
+    local dir="$work/$name"
+
+    local mode
+    for mode in full fast; do
+        mkdir -p "$dir/$mode"
+        cp "$target" "$dir/$mode/config.toml"
+        python3 "$CODEX_CONFIG" install \
+            --repo "$repo" \
+            --target "$dir/$mode/config.toml" \
+            --state "$dir/$mode/state.json"
+        if [[ $# -gt 0 ]]; then
+            edit_file "$dir/$mode/config.toml" "$@"
+        fi
+    done
+
+    python3 "$CODEX_CONFIG" remove \
+        --target "$dir/full/config.toml" \
+        --state "$dir/full/state.json"
+    python3 "$CODEX_CONFIG" remove \
+        --target "$dir/fast/config.toml" \
+        --state "$dir/fast/state.json" \
+        --fast-remove
+
+    same_toml "$dir/full/config.toml" "$dir/fast/config.toml" \
+        || fail "$name: --fast-remove differs from full remove"$'\n'"$(diff "$dir/full/config.toml" "$dir/fast/config.toml" || true)"
+}
+
+fast_remove_checks() {
+    cat > "$work/repo.toml" <<'EOF'
+model = "a"
+
+[tui]
+notifications = true
+EOF
+    cat > "$work/target.toml" <<'EOF'
+# my settings
+model = "b"
+approval_policy = "never"
+
+[tui]
+theme = "dark"
+EOF
+
+    run_phase "fast remove: untouched install" \
+        check_fast_remove untouched "$work/repo.toml" "$work/target.toml"
+    assert_file_contains "$work/untouched/fast/config.toml" 'model = "b"'
+    assert_file_contains "$work/untouched/fast/config.toml" 'approval_policy = "never"'
+
+    run_phase "fast remove: deleted managed key" \
+        check_fast_remove deleted-key "$work/repo.toml" "$work/target.toml" \
+        $'notifications = true\n' ''
+
+    run_phase "fast remove: moved managed key" \
+        check_fast_remove moved-key "$work/repo.toml" "$work/target.toml" \
+        $'notifications = true\n' '' \
+        $'approval_policy = "never"\n' $'approval_policy = "never"\nnotifications = true\n'
+    assert_file_contains "$work/moved-key/fast/config.toml" 'notifications = true'
+
+    run_phase "fast remove: user key added under a commented section" \
+        check_fast_remove commented-section "$work/repo.toml" "$work/target.toml" \
+        '[tui]' $'# terminal UI\n[tui]' \
+        'theme = "dark"' $'theme = "dark"\n# keep quiet\nanimations = false'
+    assert_file_contains "$work/commented-section/fast/config.toml" 'animations = false'
+    assert_file_contains "$work/commented-section/fast/config.toml" '# keep quiet'
+
+    cat > "$work/repo-table.toml" <<'EOF'
+[x]
+k = 1
+EOF
+    cat > "$work/target-two-tables.toml" <<'EOF'
+[x]
+other = 2
+
+[y]
+k = 1
+EOF
+
+    # Regression: a header with a trailing comment must not be read as part of the
+    # previous table, or [y] k would be taken for the managed x.k and dropped.
+    run_phase "fast remove: commented header" \
+        check_fast_remove commented-header "$work/repo-table.toml" "$work/target-two-tables.toml" \
+        $'other = 2\nk = 1\n' $'other = 2\n' \
+        '[y]' '[y]  # my table'
+    assert_file_contains "$work/commented-header/fast/config.toml" 'k = 1'
+}
+
+state_checks() {
+    local dir="$work/big-int"
+    mkdir -p "$dir"
+    printf 'big = 1\n' > "$dir/repo.toml"
+    printf 'big = 18446744073709551616\n' > "$dir/config.toml"
+
+    # Integers past 64 bits must survive the state file round trip.
+    run_phase "state: integer beyond 64 bits" \
+        python3 "$CODEX_CONFIG" install \
+            --repo "$dir/repo.toml" \
+            --target "$dir/config.toml" \
+            --state "$dir/state.json"
+    assert_file_contains "$dir/state.json" '18446744073709551616'
+    python3 "$CODEX_CONFIG" remove --target "$dir/config.toml" --state "$dir/state.json"
+    assert_file_contains "$dir/config.toml" 'big = 18446744073709551616'
+}
+
+# Install DIR/repo.toml into DIR/config.toml with CODEX_CONFIG_CACHE set to FLAG.
+install_with_cache() {
+    local dir="$1"
+    local flag="$2"
+    CODEX_CONFIG_CACHE="$flag" python3 "$CODEX_CONFIG" install \
+        --repo "$dir/repo.toml" \
+        --target "$dir/config.toml" \
+        --state "$dir/state.json" \
+        --opencode "$dir/opencode.json"
+}
+
+cache_checks() {
+    local dir="$work/cache"
+    local cache="$dir/.opencode.cache.json"
+    mkdir -p "$dir"
+    printf 'model = "a"\n' > "$dir/repo.toml"
+    printf '{"permission": {"skill": {"alpha": "allow"}}}\n' > "$dir/opencode.json"
+
+    run_phase "cache: disabled by default" install_with_cache "$dir" 0
+    assert_file_contains "$dir/config.toml" 'alpha = "allow"'
+    assert_not_exists "$cache"
+
+    run_phase "cache: miss writes the cache" install_with_cache "$dir" 1
+    assert_file_contains "$cache" '"alpha": "allow"'
+
+    # Swap the cached permissions but keep the key: a hit must use them as-is.
+    python3 - "$cache" <<'PY'
+import json
+import sys
+from pathlib import Path
+
+path = Path(sys.argv[1])
+cache = json.loads(path.read_text(encoding="utf-8"))
+cache["skill"] = {"cached": "allow"}
+path.write_text(json.dumps(cache) + "\n", encoding="utf-8")
+PY
+    run_phase "cache: hit skips opencode.json" install_with_cache "$dir" 1
+    assert_file_contains "$dir/config.toml" 'cached = "allow"'
+
+    printf '{"permission": {"skill": {"beta": "deny"}}}\n' > "$dir/opencode.json"
+    run_phase "cache: opencode.json change invalidates" install_with_cache "$dir" 1
+    assert_file_contains "$dir/config.toml" 'beta = "deny"'
+    assert_file_contains "$cache" '"beta": "deny"'
+
+    run_phase "cache: remove deletes the cache" \
+        python3 "$CODEX_CONFIG" remove --target "$dir/config.toml" --state "$dir/state.json"
+    assert_not_exists "$cache"
+
+    printf '{}\n' > "$cache"
+    run_phase "cache: remove without state deletes the cache" \
+        python3 "$CODEX_CONFIG" remove --target "$dir/config.toml" --state "$dir/state.json"
+    assert_not_exists "$cache"
+
+    install_with_cache "$dir" 1
+    rm "$dir/config.toml"
+    run_phase "cache: remove without target deletes the cache" \
+        python3 "$CODEX_CONFIG" remove --target "$dir/config.toml" --state "$dir/state.json"
+    assert_not_exists "$cache"
+    assert_not_exists "$dir/state.json"
+}
+
+main() {
+    work="$(mktemp -d)"
+    trap 'rm -rf "$work"' EXIT
+
+    fast_remove_checks
+    state_checks
+    cache_checks
+
+    echo "PASS: codex-config merge/remove checks"
+}
+
+main "$@"